@@ -0,0 +1,48 @@
+from dotenv import load_dotenv
+import os
+import logging
+from functools import lru_cache
+
+from cassandra.auth import PlainTextAuthProvider
+from cassandra.cluster import Cluster
+
+logger = logging.getLogger(__name__)
+
+# Load environment variables from .env
+load_dotenv()
+
+# Astra DB connection configuration
+ASTRA_DB_CONFIG = {
+    'secure_connect_bundle': os.getenv('SECURE_CONNECT_BUNDLE'),
+    'username': 'token',  # 'token' as the username
+    'password': os.getenv('ASTRA_PASSWORD'),
+    'api_endpoint': os.getenv('ASTRA_DB_API_ENDPOINT')
+}
+
+# Keyspace
+KEYSPACE = os.getenv('KEYSPACE') or "default_keyspace"
+
+# Connect to Astra DB once per process; every caller shares the same session.
+# Connection and keyspace errors propagate to the caller.
+@lru_cache(maxsize=1)
+def get_session():
+    auth_provider = PlainTextAuthProvider(
+        username=ASTRA_DB_CONFIG['username'],
+        password=ASTRA_DB_CONFIG['password']
+    )
+    cluster = Cluster(
+        cloud={'secure_connect_bundle': ASTRA_DB_CONFIG['secure_connect_bundle']},
+        auth_provider=auth_provider,
+        protocol_version=4
+    )
+    session = cluster.connect()
+    logger.info("Connected to Astra DB")
+
+    try:
+        session.set_keyspace(KEYSPACE)
+    except Exception:
+        # lru_cache does not cache the failure, so close this cluster before a retry opens another
+        cluster.shutdown()
+        raise
+    logger.info(f"Using keyspace: {KEYSPACE}")
+    return session
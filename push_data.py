@@ -4,9 +4,7 @@ import os
 import logging
 import uuid
 
-from cassandra.auth import PlainTextAuthProvider
-from cassandra.cluster import Cluster
-from cassandra.query import BatchStatement
+from db import ASTRA_DB_CONFIG, get_session
 
 # LangChain (for vector search)
 from langchain_openai import OpenAIEmbeddings
@@ -19,40 +17,14 @@ logger = logging.getLogger(__name__)
 # Load environment variables from .env
 load_dotenv()
 
-# Astra DB connection configuration
-ASTRA_DB_CONFIG = {
-    'secure_connect_bundle': os.getenv('SECURE_CONNECT_BUNDLE'),
-    'username': 'token',  # 'token' as the username
-    'password': os.getenv('ASTRA_PASSWORD'),
-    'api_endpoint': os.getenv('ASTRA_DB_API_ENDPOINT')
-}
-
 # Optional embedding API key for vector search
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# Connect to Astra DB
-auth_provider = PlainTextAuthProvider(
-    username=ASTRA_DB_CONFIG['username'],
-    password=ASTRA_DB_CONFIG['password']
-)
-try:
-    cluster = Cluster(
-        cloud={'secure_connect_bundle': ASTRA_DB_CONFIG['secure_connect_bundle']},
-        auth_provider=auth_provider
-    )
-    session = cluster.connect()
-    logger.info("Connected to Astra DB")
-except Exception as e:
-    logger.error(f"Failed to connect to Astra DB: {e}")
-    exit(1)
-
-# Keyspace
-KEYSPACE = os.getenv('KEYSPACE') or "default_keyspace"
+# Shared Astra DB session
 try:
-    session.set_keyspace(KEYSPACE)
-    logger.info(f"Using keyspace: {KEYSPACE}")
+    session = get_session()
 except Exception as e:
-    logger.error(f"Error setting keyspace: {e}")
+    logger.error(f"Failed to connect to Astra DB or set keyspace: {e}")
     exit(1)
 
 # Initialize Vector Store
@@ -70,54 +42,80 @@ if OPENAI_API_KEY:
     except Exception as e:
         logger.warning(f"Astra Vector Store not configured properly: {e}")
 
-# Load dataset
+# Load dataset, typing the columns we use at parse time; a missing or
+# non-numeric count fails the whole load
+CSV_DTYPES = {
+    'post_type': 'string',
+    'likes': 'int32',
+    'comments': 'int32',
+    'shares': 'int32',
+    'total_engagement': 'int32'
+}
 try:
-    data = pd.read_csv('social_media_engagement_data.csv')
+    data = pd.read_csv(
+        'social_media_engagement_data.csv',
+        usecols=list(CSV_DTYPES),
+        dtype=CSV_DTYPES
+    )
     logger.info("Successfully loaded social_media_engagement_data.csv")
 except Exception as e:
     logger.error(f"Error loading CSV file: {e}")
     exit(1)
 
+# add_texts splits its input into batches of BATCH_SIZE and sends up to
+# BATCH_CONCURRENCY of them at once; each flush is sized to fill every slot
+BATCH_SIZE = 20
+BATCH_CONCURRENCY = 16
+FLUSH_SIZE = BATCH_SIZE * BATCH_CONCURRENCY
+
 # Insert data into vector store
 def insert_data():
     if not vector_store:
         logger.error("Vector store is not initialized. Exiting data insertion.")
         return
 
-    batch_size = 100
-    records_to_vectorize = []
-
-    for index, row in data.iterrows():
-        try:
-            desc = row['post_type']
-            metadata = {
-                "content": desc,
-                "id": str(uuid.uuid4()),
-                "likes": int(row['likes']),
-                "comments": int(row['comments']),
-                "shares": int(row['shares']),
-                "total_engagement": int(row['total_engagement'])
-            }
-            records_to_vectorize.append({"text": desc, "metadata": metadata})
-
-            if (index + 1) % batch_size == 0:
-                _flush_to_vector_store(records_to_vectorize)
-                logger.info(f"Vectorized and stored records up to index {index + 1}.")
-                records_to_vectorize = []
-        except Exception as e:
-            logger.error(f"Error processing row {index + 1}: {e}")
-
-    if records_to_vectorize:
-        _flush_to_vector_store(records_to_vectorize)
-        logger.info("Vectorized and stored remaining 'post_type' fields.")
-
-def _flush_to_vector_store(records):
-    texts = [r['text'] for r in records]
-    metadatas = [r['metadata'] for r in records]
+    texts = []
+    metadatas = []
+
+    rows = data[list(CSV_DTYPES)].itertuples(index=False, name=None)
+    # Draw the random bytes for every record id in one read
+    random_bytes = os.urandom(16 * len(data))
+
+    for index, (desc, likes, comments, shares, total_engagement) in enumerate(rows):
+        record_id = uuid.UUID(bytes=random_bytes[index * 16:(index + 1) * 16], version=4)
+        metadatas.append({
+            "content": desc,
+            "id": str(record_id),
+            "likes": likes,
+            "comments": comments,
+            "shares": shares,
+            "total_engagement": total_engagement
+        })
+        texts.append(desc)
+
+    # A failed add_texts call loses at most FLUSH_SIZE rows
+    stored = 0
+    for start in range(0, len(texts), FLUSH_SIZE):
+        end = start + FLUSH_SIZE
+        stored += len(_flush_to_vector_store(texts[start:end], metadatas[start:end]))
+
+    logger.info(f"Vectorized and stored {stored} 'post_type' fields.")
+    failed = len(data) - stored
+    if failed:
+        logger.error(f"Failed to store {failed} of {len(data)} rows.")
+
+# Returns the ids of the stored records, or an empty list if the flush failed
+def _flush_to_vector_store(texts, metadatas):
     try:
-        vector_store.add_texts(texts=texts, metadatas=metadatas)
+        return vector_store.add_texts(
+            texts=texts,
+            metadatas=metadatas,
+            batch_size=BATCH_SIZE,
+            batch_concurrency=BATCH_CONCURRENCY
+        )
     except Exception as ve:
         logger.error(f"Error vectorizing records: {ve}")
+        return []
 
 # analysis function
 def analyze_post_type(post_type: str, top_k=5):